@@ -36,6 +36,10 @@ define('canvas_widget', ["@jupyter-widgets/base"], function(widgets) {
       // Timing control
       this._tic = Date.now();
       this._update_requests = [];
+
+      // Mouse-move coalescing
+      this._pending_mouse_event = null;
+      this._mouse_flush_scheduled = false;
       
       // Start the event loop.
       this.start()
@@ -81,26 +85,27 @@ define('canvas_widget', ["@jupyter-widgets/base"], function(widgets) {
       while (this._update_requests.length) {
         clearTimeout(this._update_requests.pop());
       }
-      
-      this.do_update();
-      var fps = this.model.get('fps');
-      var toc = Date.now();
-      var elapsed_time = toc - this._tic;
-      this._tic = toc;
-      var wait = 1000/fps - elapsed_time;
-      wait = Math.max(0, wait);
-      console.log(wait);
-      this._update_requests.push(setTimeout(this.start.bind(this), wait));
-    },
 
-    do_update: function() {
+      // Prepare the ImageData for the incoming frame immediately so it
+      // is ready before the browser's next paint, but defer the actual
+      // draw to an animation frame.  The next update request is
+      // scheduled right away, so python can produce frame N+1 while
+      // the browser is still painting frame N.
       var _data = this.model.get('_view_rgba');
       if (_data && _data.byteLength) {
         var _raw_data = new Uint8ClampedArray(_data.buffer);
         var _width = this.model.get('_view_image_width');
         this._image_data = new ImageData(_raw_data, _width);
-        this.draw_image();
+        requestAnimationFrame(this.draw_image.bind(this));
       }
+
+      var fps = this.model.get('fps');
+      var toc = Date.now();
+      var elapsed_time = toc - this._tic;
+      this._tic = toc;
+      var wait = 1000/fps - elapsed_time;
+      wait = Math.max(0, wait);
+      this._update_requests.push(setTimeout(this.start.bind(this), wait));
     },
     
     draw_image: function() {
@@ -174,13 +179,35 @@ define('canvas_widget', ["@jupyter-widgets/base"], function(widgets) {
       // handles coordinates of mouse
       ev.coor_X = event.offsetX;
       ev.coor_Y = event.offsetY;
-      
+
+      if (ev.type == "mousemove") {
+        // Coalesce move events: keep only the latest position and send
+        // it at most once per animation frame so dragging does not
+        // flood the comm channel with intermediate positions.
+        this._pending_mouse_event = ev;
+        if (!this._mouse_flush_scheduled) {
+          this._mouse_flush_scheduled = true;
+          requestAnimationFrame(this.flush_mouse_event.bind(this));
+        }
+        return;
+      }
+
       //sends ev back to python as dictionary
       this.model.set('mouse_event_data', ev);
-          
+
       this.model.save_changes();
       //console.log(event.type);
     },
+
+    // sends the latest coalesced mouse-move event to python
+    flush_mouse_event: function () {
+      this._mouse_flush_scheduled = false;
+      if (this._pending_mouse_event) {
+        this.model.set('mouse_event_data', this._pending_mouse_event);
+        this._pending_mouse_event = null;
+        this.model.save_changes();
+      }
+    },
       
     // handle key presses
     handle_key_event: function (event) {
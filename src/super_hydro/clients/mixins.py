@@ -3,24 +3,116 @@
 These mixins provide common functionality for various clients.
 """
 
+import threading
+
 from matplotlib import cm
 
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
 __all__ = ["ClientDensityMixin"]
 
 
+# Number of colors in the lookup table.  The density is quantized to
+# this many levels, which is all a display can resolve anyway.
+_N_COLORS = 256
+
+# Precomputed uint8 lookup table for the colormap.  Indexing into this
+# replaces the per-frame matplotlib colormap call, which normalizes and
+# produces a float64 RGBA intermediate (32 bytes/pixel) before the cast
+# to uint8.
+_VIRIDIS_LUT = cm.viridis(np.linspace(0, 1, _N_COLORS), bytes=True)
+_VIRIDIS_LUT.flags.writeable = False
+
+
+if numba:
+
+    @numba.njit(parallel=True, cache=True)
+    def _density_to_rgba(density, lut, vmin, scale, rgba):
+        """Fused quantize + table lookup over the density array.
+
+        A single parallel pass writes the uint8 rgba directly into the
+        provided output buffer, avoiding the quantized-index temporary
+        of the pure numpy path.
+        """
+        Nx, Ny = density.shape
+        for i in numba.prange(Nx):
+            for j in range(Ny):
+                v = (density[i, j] - vmin) * scale
+                if v < 0.0:
+                    v = 0.0
+                elif v > _N_COLORS - 1:
+                    v = _N_COLORS - 1
+                k = int(v)
+                for c in range(4):
+                    rgba[i, j, c] = lut[k, c]
+        return rgba
+
+
+else:
+    _density_to_rgba = None
+
+
 class ClientDensityMixin:
     """Basic client mixin with functions for manipulating density array."""
 
-    @staticmethod
-    def get_rgba_from_density(density):
+    # Preallocated rgba output buffers, reused so the hot path does no
+    # per-frame allocation.  Two buffers alternate so the previous
+    # frame can still be encoded or sent while the next one is filled
+    # (the notebook client prefetches frames on a worker thread).  The
+    # buffers are thread-local and keyed by frame shape: the flask
+    # client shares one instance between the push threads of several
+    # running models, which may have different grids.
+    _rgba_local = None
+
+    def get_rgba_from_density(self, density, vmin=0.0, vmax=None):
         """Convert the density array into an rgba array for display.
 
+        The density is quantized to a uint8 index which is used to look
+        up the color in a precomputed uint8 table, so no float RGBA
+        temporaries are formed.  The result is written into one of two
+        alternating output buffers: it remains valid until the call
+        after next.
+
         One must be a bit careful to transpose the arrays so that indexing works
-        properly."""
+        properly.
+
+        Parameters
+        ----------
+        density : array-like
+           Density array.
+        vmin, vmax : float
+           Density values mapped to the ends of the colormap.  If
+           `vmax` is `None` (default), then use `density.max()`.
+           Callers with fixed density scales can pass these to avoid
+           the per-frame reduction.
+        """
         density = density.T[::-1]
-        # array = cm.viridis((n_-n_.min())/(n_.max()-n_.min()))
-        array = cm.viridis(density / density.max())
-        # array = self._update_frame_with_tracer_particles(array)
-        array *= int(255 / array.max())  # normalize values
-        rgba = array.astype(dtype="uint8")
+        if vmax is None:
+            vmax = density.max()
+        scale = (_N_COLORS - 1) / (vmax - vmin) if vmax > vmin else 0.0
+        if self._rgba_local is None:
+            self._rgba_local = threading.local()
+        buffers = getattr(self._rgba_local, "buffers", None)
+        if buffers is None:
+            buffers = self._rgba_local.buffers = {}
+        shape = density.shape + (4,)
+        entry = buffers.get(shape)
+        if entry is None:
+            # [buffer, buffer, index of the buffer last handed out]
+            entry = buffers[shape] = [
+                np.empty(shape, dtype=np.uint8),
+                np.empty(shape, dtype=np.uint8),
+                0,
+            ]
+        entry[2] ^= 1
+        rgba = entry[entry[2]]
+        if _density_to_rgba is not None:
+            return _density_to_rgba(density, _VIRIDIS_LUT, vmin, scale, rgba)
+        index = ((density - vmin) * scale).clip(0, _N_COLORS - 1).astype("uint8")
+        np.take(_VIRIDIS_LUT, index, axis=0, out=rgba)
         return rgba
@@ -11,10 +11,10 @@ Control is driven by alternating between python and javascript.  We
 register the update function which the Canvas will then call after the
 browser is finished displaying the last frame.
 """
-from contextlib import contextmanager
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 import io
 import time
-import IPython
 
 from matplotlib import cm
 
@@ -35,6 +35,28 @@ log = _LOGGER.log
 log_task = _LOGGER.log_task
 
 
+# Cached TurboJPEG encoder: None until first use, False if PyTurboJPEG
+# (or the underlying libjpeg-turbo) is unavailable.
+_TURBOJPEG = None
+
+
+def _get_turbojpeg():
+    """Return a `turbojpeg.TurboJPEG` encoder, or `None` if unavailable.
+
+    libjpeg-turbo encodes straight from the numpy buffer several times
+    faster than the PIL path, so use it when installed.
+    """
+    global _TURBOJPEG
+    if _TURBOJPEG is None:
+        try:
+            import turbojpeg
+
+            _TURBOJPEG = turbojpeg.TurboJPEG()
+        except (ImportError, OSError):
+            _TURBOJPEG = False
+    return _TURBOJPEG or None
+
+
 class App(object):
     server = None
 
@@ -80,7 +102,10 @@ class _Interrupted(object):
 
 
 class NotebookApp(ClientDensityMixin, App):
-    fmt = "PNG"
+    # Image format for get_image().  None (default) sends the raw RGBA
+    # buffer to the Canvas widget which blits it in the browser with
+    # putImageData - no per-frame encode.  Set to "jpeg" to compress.
+    fmt = None
     browser_control = True
     server = None
 
@@ -106,10 +131,37 @@ class NotebookApp(ClientDensityMixin, App):
     #
     # These allow the Javascript to drive the application, but should
     # only function if running.
+    # Pending widget changes waiting to be flushed to the server, keyed
+    # by parameter name so only the last value for each survives.
+    _pending_changes = None
+    _flush_handle = None
+
     def on_value_change(self, change):
+        """Throttled callback for interactive widgets.
+
+        Dragging a slider fires an event for every intermediate value,
+        which would send a `server.set()` RPC per event and saturate the
+        comm channel.  Instead we accumulate changes and flush them at
+        most `opts.fps` times per second; duplicate names collapse so
+        the server always sees the final value.
+        """
         if not self._running:
             return
-        self.server.set({change["owner"].name: change["new"]})
+        if self._pending_changes is None:
+            self._pending_changes = {}
+        self._pending_changes[change["owner"].name] = change["new"]
+        if self._flush_handle is None:
+            loop = asyncio.get_event_loop()
+            self._flush_handle = loop.call_later(
+                1.0 / self.opts.fps, self._flush_value_changes
+            )
+
+    def _flush_value_changes(self):
+        """Send the accumulated widget changes to the server."""
+        self._flush_handle = None
+        changes, self._pending_changes = self._pending_changes, {}
+        if self._running and changes:
+            self.server.set(changes)
 
     def on_click(self, button):
         if not self._running:
@@ -119,15 +171,64 @@ class NotebookApp(ClientDensityMixin, App):
         else:
             self.server.do(button.name)
 
+    # Future for the next frame's data, submitted to _executor so the
+    # server round-trip overlaps with the colormap and display of the
+    # current frame.
+    _executor = None
+    _pending_frame = None
+    _on_update = None
+
     def on_update(self):
-        """Callback to update frame when browser is ready."""
-        if not self._running:
-            return
-        with self.sync():
+        """Callback to update frame when browser is ready.
+
+        The frame-rate limiting is done by whoever drives this callback
+        (the Canvas widget waits `1/fps` between update requests, and
+        `_run_update_loop` awaits the remainder of the frame), so there
+        is no need to block the kernel here.
+        """
+        if self._on_update is None:
+            self._on_update = self._specialize_on_update()
+        self._on_update()
+
+    def _specialize_on_update(self):
+        """Return an update callback specialized to the current run.
+
+        Python resolves every name in the per-frame path through
+        attribute lookups.  The hot references are fixed once the run
+        starts (for given grid size and fps), so bind them to closure
+        locals here.  `run()` resets `_on_update` so a new run picks up
+        changed options.
+        """
+        submit = self._executor.submit
+        fetch = self._fetch_frame
+        get_rgba = self.get_rgba_from_density
+        update_fg = self._update_fg_objects
+        density_widget = self._density
+
+        def on_update():
+            if not self._running:
+                return
             self._frame += 1
-            density = self.density
-            self._density.rgba = self.get_rgba_from_density(density)
-            self._density.fg_objects = self._update_fg_objects()
+            future = self._pending_frame
+            if future is None:
+                future = submit(fetch)
+            density, tracers = future.result()
+            # Prefetch the next frame while we colormap and send this
+            # one.
+            self._pending_frame = submit(fetch)
+            density_widget.rgba = get_rgba(density)
+            density_widget.fg_objects = update_fg(tracers=tracers)
+
+        return on_update
+
+    def _fetch_frame(self):
+        """Fetch everything the next frame needs from the server.
+
+        The density and tracers ride in a single batched RPC, halving
+        the number of round-trips per frame.
+        """
+        arrays = self.server.get_arrays(["density", "tracers"])
+        return (arrays["density"], arrays["tracers"])
 
     ######################################################################
     # Server Communication
@@ -136,9 +237,18 @@ class NotebookApp(ClientDensityMixin, App):
     def quit(self):
         self.server.do("quit")
         self._running = False
-
-    def get_widget(self):
-        layout = self.get_layout()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    # Cached result of get_widget: rebuilding the tree re-registers the
+    # observers and button callbacks, so build it only once.
+    _layout_widget = None
+
+    def get_widget(self, layout_repr=None):
+        if self._layout_widget is not None:
+            return self._layout_widget
+        layout = self.get_layout(layout_repr=layout_repr)
         (
             self._interactive_widgets,
             special_widgets,
@@ -177,24 +287,56 @@ class NotebookApp(ClientDensityMixin, App):
         for w in self._interactive_widgets:
             w.observe(self.on_value_change, names="value")
 
+        self._layout_widget = layout
         return layout
 
     def get_image(self, rgba):
+        """Return the frame as bytes for display.
+
+        The Canvas widget accepts the raw RGBA buffer directly, so by
+        default (`fmt = None`) no encoding is done at all - the deflate
+        pass of a PNG encode dominated the python time per frame.  An
+        encoded format is only produced if explicitly requested with
+        `fmt` (e.g. "jpeg" to save bandwidth on slow connections).
+        """
         if not self._running:
             return
-        import PIL
-
+        if self.fmt is None:
+            return rgba.tobytes()
         if self.fmt.lower() == "jpeg":
             # Discard alpha channel
-            rgba = rgba[..., :3]
-        img = PIL.Image.fromarray(rgba)
+            rgba = np.ascontiguousarray(rgba[..., :3])
+            jpeg = _get_turbojpeg()
+            if jpeg:
+                import turbojpeg
+
+                return jpeg.encode(rgba, pixel_format=turbojpeg.TJPF_RGB)
+        import PIL.Image
+
+        # frombuffer wraps the existing buffer instead of copying it
+        # the way fromarray does.
+        mode = "RGB" if rgba.shape[-1] == 3 else "RGBA"
+        Ny, Nx = rgba.shape[:2]
+        img = PIL.Image.frombuffer(mode, (Nx, Ny), rgba, "raw", mode, 0, 1)
         b = io.BytesIO()
         img.save(b, self.fmt)
         return b.getvalue()
 
-    def get_layout(self):
-        """Return the model specified layout."""
-        layout = eval(self.server.get(["layout"])["layout"], widgets.__dict__)
+    def get_layout(self, layout_repr=None):
+        """Return the model specified layout.
+
+        Callers that already fetched the layout repr (batched with
+        other startup parameters) can pass it as `layout_repr` to skip
+        the round-trip.
+
+        Note: each call evaluates a fresh widget tree.  Sharing widget
+        instances between apps would stack their observers; the
+        per-instance cache in `get_widget` avoids repeated evals within
+        one app.
+        """
+        if layout_repr is None:
+            layout_repr = self.server.get(["layout"])["layout"]
+        layout = eval(layout_repr, widgets.__dict__)
         return layout
 
     def get_tracer_particles(self):
@@ -209,12 +351,19 @@ class NotebookApp(ClientDensityMixin, App):
             self.server = communication.LocalNetworkServer(opts=self.opts)
         from IPython.display import display
 
-        _res = self.server.get(["Nx", "Ny"])
+        # One batched round-trip for everything we need at startup.
+        _res = self.server.get(["Nx", "Ny", "layout"])
         self.Nx, self.Ny = _res["Nx"], _res["Ny"]
         self._frame = 0
         self._tic0 = time.time()
 
-        display(self.get_widget())
+        # Single worker so frame N+1 is fetched from the server while
+        # frame N is colormapped and sent to the browser.
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._pending_frame = None
+        self._on_update = None  # Respecialized below once widgets exist.
+
+        display(self.get_widget(layout_repr=_res["layout"]))
 
         # Broken!  Fix aspect ratio better with reasonable sliders.
         Nx = max(500, self.Nx)
@@ -224,66 +373,80 @@ class NotebookApp(ClientDensityMixin, App):
 
         self._frame = 0
         if self.browser_control:
+            # The javascript drives the handlers: the Canvas widget
+            # sends an update request once the browser has displayed
+            # the previous frame.  There is nothing to poll - we used
+            # to spin kernel.do_one_iteration() here, but that burned
+            # CPU and blocked the kernel from servicing widget
+            # messages.  Return and let the kernel's event loop run.
             self._density.on_update(callback=self.on_update)
             self.on_update()
-            kernel = IPython.get_ipython().kernel
-            while not interrupted and self._running:
-                # This should not strictly be needed since the
-                # javascript will drive the handlers, but due to
-                # issues with interrupts etc. we can't seem to rely on
-                # being able to catch an interrupt if we return.  So
-                # we do a dummy event loop here.
-                kernel.do_one_iteration()
-                time.sleep(kernel._poll_interval)
         else:
-            while not interrupted and self._running:
-                tic0 = time.time()
-                self.on_update()
-                toc = time.time()
-                self._msg.value = "{:.2f}fps".format(self._frame / (toc - tic0))
+            # Drive the updates ourselves from the kernel's asyncio
+            # event loop so widget messages are serviced between
+            # frames.
+            self._update_task = asyncio.ensure_future(
+                self._run_update_loop(interrupted=interrupted)
+            )
+
+    async def _run_update_loop(self, interrupted=False):
+        """Update frames on a timer from the kernel's event loop.
+
+        Awaiting `asyncio.sleep` between frames (rather than polling in
+        a tight loop) leaves the kernel free to process widget messages
+        concurrently.
+        """
+        tic0 = time.time()
+        while not interrupted and self._running:
+            tic = time.perf_counter()
+            self.on_update()
+            toc = time.time()
+            self._msg.value = "{:.2f}fps".format(self._frame / (toc - tic0))
+            dt = time.perf_counter() - tic
+            await asyncio.sleep(max(0, 1.0 / self.opts.fps - dt))
         if self._running:
             self.quit()
 
-    def _update_frame_with_tracer_particles(self, array):
-        tracers = self.get_tracer_particles()
-        ix, iy = [np.round(_i).astype(int) for _i in tracers]
+    # Tracer color scaled to the rgba range, computed once.
+    _tracer_rgba = None
+
+    def _update_frame_with_tracer_particles(self, array, tracers=None):
+        """Blend the tracer particles into the rgba frame.
+
+        The tracers arrive as separate ix/iy rows (structure of arrays)
+        so the rounding, gather, and alpha blend are each a single
+        vectorized operation with no per-particle python loop.
+        """
+        if tracers is None:
+            tracers = self.get_tracer_particles()
+        if tracers is None or len(tracers) == 0:
+            return array
+        ix = np.rint(tracers[0]).astype(np.intp)
+        iy = np.rint(tracers[1]).astype(np.intp)
+        if self._tracer_rgba is None:
+            self._tracer_rgba = 255 * np.asarray(self.opts.tracer_color)
         alpha = self.opts.tracer_alpha
-        array[iy, ix, ...] = (1 - alpha) * array[iy, ix, ...] + alpha * np.array(
-            self.opts.tracer_color
-        )
+        array[iy, ix] = (
+            (1 - alpha) * array[iy, ix] + alpha * self._tracer_rgba
+        ).astype(array.dtype)
         return array
 
-    def _update_fg_objects(self):
+    def _update_fg_objects(self, tracers=None):
         tracer_container = {"tracer": []}
-        tracers = self.get_tracer_particles()
+        if tracers is None:
+            tracers = self.get_tracer_particles()
         if tracers is not None and len(tracers) > 0:
             ix, iy = tracers
             alpha = 1
             color = self.opts.tracer_color
-            _num = 0
-            for _i in ix:
-                tracer_container["tracer"].append(
-                    ["tracer", ix[_num], iy[_num], 0.5, color, alpha, 0, 0]
-                )
-                _num += 1
+            # tolist() converts to python scalars in one pass - much
+            # faster than indexing the arrays per particle.
+            tracer_container["tracer"] = [
+                ["tracer", _ix, _iy, 0.5, color, alpha, 0, 0]
+                for _ix, _iy in zip(np.asarray(ix).tolist(), np.asarray(iy).tolist())
+            ]
         return tracer_container
 
-    @contextmanager
-    def sync(self):
-        """Provides a context that will wait long enough to not
-        exceed `self.opts.fps` frames per second.  Also executes the
-        ipython event loop to ensure widgets are updated.
-        """
-        tic = time.perf_counter()
-        try:
-            yield
-        finally:
-            dt = time.perf_counter() - tic
-            t_sleep = 1.0 / self.opts.fps - dt
-            if t_sleep > 0:
-                time.sleep(t_sleep)
-        return
-
 
 _OPTS = None
 
@@ -13,6 +13,7 @@ objects.
 
 Unless otherwise specified, messages should by bytes objects.
 """
+import threading
 import time
 
 import numpy as np
@@ -95,13 +96,45 @@ class Client(object):
             return self.socket.recv()
 
     def get_array(self, msg, flags=0, copy=True, track=False):
-        """Request a numpy array."""
+        """Request a numpy array.
+
+        With `copy=False` the returned array is a read-only zero-copy
+        view onto the received zmq frame: the data stays in the buffer
+        the messaging layer already owns instead of being copied out,
+        and remains valid for as long as the array holds a reference.
+        """
         # https://pyzmq.readthedocs.io/en/latest/serialization.html
         with self.log_task("Getting {} from server".format(msg)):
             self.socket.send(msg)
             md = self.socket.recv_json(flags=flags)
             msg = self.socket.recv(flags=flags, copy=copy, track=track)
-            return np.frombuffer(msg, dtype=md["dtype"]).reshape(md["shape"])
+            buf = msg if copy else msg.buffer
+            return np.frombuffer(buf, dtype=md["dtype"]).reshape(md["shape"])
+
+    def get_arrays(self, params, flags=0, copy=True, track=False):
+        """Request several numpy arrays in a single transaction.
+
+        The server replies with one multipart message - a JSON metadata
+        frame followed by one buffer per array - so only a single
+        request/reply round-trip is needed per frame.
+        """
+        with self.log_task(f"Getting arrays {params} from server"):
+            self.socket.send(b"get_arrays")
+            response = self.socket.recv()
+            if response != b"ok":
+                raise IOError(
+                    f"Server declined request to get arrays saying {response}"
+                )
+            self.socket.send_json(list(params))
+            md = self.socket.recv_json(flags=flags)
+            arrays = {}
+            for param in params:
+                msg = self.socket.recv(flags=flags, copy=copy, track=track)
+                buf = msg if copy else msg.buffer
+                arrays[param] = np.frombuffer(buf, dtype=md[param]["dtype"]).reshape(
+                    md[param]["shape"]
+                )
+            return arrays
 
     def send_array(self, msg, A, flags=0, copy=True, track=False):
         """Request a numpy array."""
@@ -189,6 +222,18 @@ class Server(object):
         self.socket.send_json(md, flags | zmq.SNDMORE)
         self.socket.send(A, flags, copy=copy, track=track)
 
+    def send_arrays(self, arrays, flags=0, copy=True, track=False):
+        """Send several numpy arrays as one multipart message."""
+        # https://pyzmq.readthedocs.io/en/latest/serialization.html
+        md = {key: dict(dtype=str(A.dtype), shape=A.shape) for key, A in arrays.items()}
+        if not arrays:
+            return self.socket.send_json(md)
+        self.socket.send_json(md, flags | zmq.SNDMORE)
+        keys = list(arrays)
+        for key in keys[:-1]:
+            self.socket.send(arrays[key], flags | zmq.SNDMORE, copy=copy, track=track)
+        self.socket.send(arrays[keys[-1]], flags, copy=copy, track=track)
+
     def get_array(self, response=b"", flags=0, copy=True, track=False):
         """Receive and return a numpy array."""
         # https://pyzmq.readthedocs.io/en/latest/serialization.html
@@ -212,27 +257,41 @@ class LocalNetworkServer:
         self.log_task = self.logger.log_task
 
         self.opts = opts
+        # Serializes access to the underlying Client: zmq REQ sockets
+        # are not thread-safe and enforce strict send/recv alternation,
+        # but the notebook client issues requests from both the kernel
+        # thread (set, do, get) and its prefetch worker (get_arrays).
+        self._comm_lock = threading.Lock()
         with self.log_task("Connecting to server"):
             self.comm = Client(opts=self.opts)
 
     def get_available_commands(self, client=None):
-        return self.comm.get(params=["available_commands"])["available_commands"]
+        with self._comm_lock:
+            return self.comm.get(params=["available_commands"])["available_commands"]
 
     def do(self, action, client=None):
-        self.comm.do(action)
+        with self._comm_lock:
+            self.comm.do(action)
 
     def get(self, params, client=None):
-        return self.comm.get(params=params)
-
-        param_dict = {param: self.comm.get(param.encode()) for param in params}
-        return param_dict
+        with self._comm_lock:
+            return self.comm.get(params=params)
 
     def set(self, param_dict, client=None):
         """Set specified parameter."""
-        self.comm.send(b"set", param_dict)
+        with self._comm_lock:
+            self.comm.send(b"set", param_dict)
 
     def get_array(self, param, client=None):
-        return self.comm.get_array(param.encode())
+        # Zero-copy: the array is a read-only view onto the received
+        # zmq frame, so the frame data is shared rather than copied.
+        with self._comm_lock:
+            return self.comm.get_array(param.encode(), copy=False)
+
+    def get_arrays(self, params, client=None):
+        """Get several arrays in a single transaction."""
+        with self._comm_lock:
+            return self.comm.get_arrays(params, copy=False)
 
     def reset(self, client=None):
         """Reset the server."""
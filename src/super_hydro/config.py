@@ -1,4 +1,5 @@
 """Configuration options for both client and server."""
+import functools
 import os.path
 
 import configargparse
@@ -74,8 +75,14 @@ PARSER.add(
 )
 
 
+@functools.lru_cache()
 def get_server_parser():
-    """Return the parser with server configuration"""
+    """Return the parser with server configuration.
+
+    Cached: the options are added to the global PARSER, so only the
+    first call needs to do the work (and repeated calls must not try to
+    re-register the same options).
+    """
     PARSER.add("-m", "--model", help="Physical model: i.e. gpe.BEC")
     PARSER.add("--Nx", default=64, type=int, help="Horizontal grid resolution")
     PARSER.add("--Ny", default=32, type=int, help="Vertical grid resolution")
@@ -106,8 +113,12 @@ def get_server_parser():
     return PARSER
 
 
+@functools.lru_cache()
 def get_client_parser():
-    """Return the parser with client configuration"""
+    """Return the parser with client configuration.
+
+    Cached for the same reason as :func:`get_server_parser`.
+    """
     #    PARSER.add('--window_width',
     #               help="Window width (pixels)",
     #               default=600, type=int)
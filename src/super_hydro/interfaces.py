@@ -155,6 +155,20 @@ class IServer(Interface):
     def get_array(param, client=None):
         """Return the specified array."""
 
+    def get_arrays(params, client=None):
+        """Return the specified arrays in a single transaction.
+
+        Parameters
+        ----------
+        params : [str]
+           List of array names.
+
+        Returns
+        -------
+        arrays : {param: array}
+           Dictionary of the corresponding arrays.
+        """
+
     def reset(client=None):
         """Reset server and return default parameters.
 
@@ -64,7 +64,7 @@ class TracerParticles(object):
         if not hasattr(self, "v_trace"):
             self.update_tracer_velocity()
         pos = self._par_pos
-        ix, iy = [np.round(_i).astype(int) for _i in self.get_inds(pos, model=model)]
+        ix, iy = np.rint(self.get_inds(pos, model=model)).astype(np.intp)
         v = self.v_trace[ix, iy]
         pos += dt * v
 
@@ -139,8 +139,19 @@ class Computation(ThreadMixin):
 
     pause_timeout = 0.1  # Time to wait when paused.
 
+    # Class-level default: do_reset() runs in __init__ before the ring
+    # buffer is attached.
+    density_ring = None
+
     def __init__(
-        self, opts, message_queue, param_queue, density_queue, pot_queue, tracer_queue
+        self,
+        opts,
+        message_queue,
+        param_queue,
+        density_queue,
+        pot_queue,
+        tracer_queue,
+        density_ring=None,
     ):
         self.opts = opts
         self.do_reset()
@@ -149,7 +160,9 @@ class Computation(ThreadMixin):
         self.density_queue = density_queue
         self.tracer_queue = tracer_queue
         self.pot_queue = pot_queue
+        self.density_ring = density_ring
         self.fps = opts.fps
+        self.frame_interval = 1.0 / self.fps
         self.steps = opts.steps
         self.paused = True
         self.logger = _LOGGER
@@ -181,7 +194,7 @@ class Computation(ThreadMixin):
         finally:
             dt = time.perf_counter() - tic
             self._times.append(dt)
-            t_sleep = max(0, 1.0 / self.fps - dt)
+            t_sleep = max(0, self.frame_interval - dt)
             time.sleep(t_sleep)
 
     @profile("prof.dat")
@@ -195,6 +208,11 @@ class Computation(ThreadMixin):
                     time.sleep(self.pause_timeout)
                 else:
                     self.model.step(self.steps, tracer_particles=self.tracer_particles)
+                    if self.density_ring is not None:
+                        # Publish the latest frame so clients can read
+                        # it without a round-trip through the message
+                        # queue.  (deque.append is thread-safe.)
+                        self.density_ring.append(self.model.get_density())
                 self.process_queue()
 
         self.logger.info("Computation Finished.")
@@ -243,11 +261,14 @@ class Computation(ThreadMixin):
         self.density_queue.put(self.model.get_density())
 
     def do_get_tracers(self):
-        tracers = np.empty(0)
+        tracers = np.empty(0, dtype=np.float32)
         if self.opts.tracer_particles and "tracer_particles" in self.model.params:
             trpos = self.tracer_particles.get_tracer_particles()
             trinds = self.tracer_particles.get_inds(trpos, model=self.model)
-            tracers = np.asarray(trinds)
+            # float32 halves the wire bytes but keeps the sub-cell
+            # positions the clients need for smooth display (they scale
+            # the indices up to canvas pixels).
+            tracers = np.asarray(trinds, dtype=np.float32)
         self.tracer_queue.put(tracers)
 
     def do_reset_tracers(self):
@@ -263,6 +284,10 @@ class Computation(ThreadMixin):
         opts = self.opts
         self.model = opts.Model(opts=opts)
         print(self.model.__dict__)
+        if self.density_ring is not None:
+            # Discard frames from the old model so clients fall back to
+            # the queue and get the new model's first frame.
+            self.density_ring.clear()
         self.do_reset_tracers()
 
     def unknown_command(self, msg, *v):
@@ -293,6 +318,9 @@ class Server(ThreadMixin):
         self.density_queue = queue.Queue()
         self.tracer_queue = queue.Queue()
         self.pot_queue = queue.Queue()
+        # Ring buffer holding the most recent frames published by the
+        # computation thread.
+        self.density_ring = deque(maxlen=2)
         self.computation = Computation(
             opts=opts,
             param_queue=self.param_queue,
@@ -300,6 +328,7 @@ class Server(ThreadMixin):
             density_queue=self.density_queue,
             pot_queue=self.pot_queue,
             tracer_queue=self.tracer_queue,
+            density_ring=self.density_ring,
         )
         self._param_cache = {}
         self.computation_thread = threading.Thread(target=self.computation.run)
@@ -325,10 +354,13 @@ class Server(ThreadMixin):
         self.init(name="Server", shutdown_min=self.opts.shutdown)
         self.computation_thread.start()
         self.message_queue.put(("start",))
+        # Hoisted out of the loop: neither the poll interval nor the
+        # fps change while the server is running.
+        poll_interval = min(self._poll_interval, 1 / self.opts.fps)
         try:
             while not self.finished and not interrupted:
                 self.heartbeat()
-                time.sleep(min(self._poll_interval, 1 / self.opts.fps))
+                time.sleep(poll_interval)
         finally:
             self.message_queue.put(("quit",))
             # print(f"finished status is {self.finished} and Interrupted is {interrupted}")
@@ -382,6 +414,10 @@ class Server(ThreadMixin):
     # Do commands
     def _do_reset(self, client=None):
         """Reset the server."""
+        # Clear immediately as well as in Computation.do_reset so no
+        # pre-reset frame is served while the reset message waits in
+        # the queue.
+        self.density_ring.clear()
         self.message_queue.put(("reset",))
         self.model = self.opts.Model(opts=self.opts)
 
@@ -406,10 +442,28 @@ class Server(ThreadMixin):
         return trdata
 
     def _get_array_density(self, client=None):
-        """Return the density data."""
-        self.message_queue.put(("get_density",))
-        density = np.ascontiguousarray(self.density_queue.get())
-        return density
+        """Return the density data, quantized to uint8.
+
+        The computation thread publishes frames to a ring buffer, so
+        normally we can return the latest frame directly rather than
+        blocking on a request/reply through the message queue (which
+        the computation thread only services once per frame).
+
+        Quantizing here cuts the transport to 1 byte per pixel (from 8
+        for float64).  The clients only push the density through a
+        256-entry colormap, so no displayed precision is lost.
+        """
+        if self.density_ring:
+            density = self.density_ring[-1]
+        else:
+            self.message_queue.put(("get_density",))
+            density = self.density_queue.get()
+        density_max = density.max()
+        if density_max > 0:
+            density = (density * (255 / density_max)).astype(np.uint8)
+        else:
+            density = density.astype(np.uint8)
+        return np.ascontiguousarray(density)
 
     # Get and Set commands
     def _get(self, param, client=None):
@@ -557,6 +611,15 @@ class Server(ThreadMixin):
         else:
             return method(client=client)
 
+    def get_arrays(self, params, client=None):
+        """Get the specified arrays.
+
+        Batching several arrays into one call lets the network layer
+        send them in a single round-trip.
+        """
+        self._count("get_arrays")
+        return {param: self.get_array(param, client=client) for param in params}
+
     def reset(self, client=None):
         """Reset server and return default parameters.
 
@@ -598,6 +661,7 @@ class NetworkServer(Server):
         self.computation_thread.start()
         self.message_queue.put(("start",))
         self.shutdown = False
+        poll_interval = min(self._poll_interval, 1 / self.opts.fps)
         try:
             self.init(name="NetworkServer", shutdown_min=self.opts.shutdown)
             while not self.finished and not interrupted:
@@ -605,9 +669,7 @@ class NetworkServer(Server):
                 try:
                     # Do this so we can receive interrupted messages
                     # if the user interrupts.
-                    client_message = self.comm.recv(
-                        timeout=min(self._poll_interval, 1 / self.opts.fps)
-                    )
+                    client_message = self.comm.recv(timeout=poll_interval)
                 except communication.TimeoutError:
                     continue
 
@@ -622,6 +684,9 @@ class NetworkServer(Server):
                     self.comm.send_array(self._get_array_density())
                 elif client_message == b"tracers":
                     self.comm.send_array(self._get_array_tracers())
+                elif client_message == b"get_arrays":
+                    params = self.comm.get_params()
+                    self.comm.send_arrays(self.get_arrays(params=params))
                 else:
                     print("Unknown data type")
                     print("client message:", client_message)
@@ -181,9 +181,19 @@ function FlaskClient(name, document_) {
   mouse_down = false;
  }
  
+ let pending_f_xy = null;
  function onMouseMove(e) {
   if (mouse_down) {
-   moveFinger(getCursorPosition(e));
+   // Coalesce move events: keep only the latest position and send at
+   // most one finger update per animation frame.
+   const need_flush = (pending_f_xy === null);
+   pending_f_xy = getCursorPosition(e);
+   if (need_flush) {
+    requestAnimationFrame(function () {
+     moveFinger(pending_f_xy);
+     pending_f_xy = null;
+    });
+   }
   }
  }
  
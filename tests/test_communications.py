@@ -1,5 +1,6 @@
 from argparse import Namespace
 import multiprocessing
+import threading
 # import os.path
 # import sys
 
@@ -34,6 +35,11 @@ def run_server(host='localhost', port=12654):
         elif request == b"Get Complex Array":
             server.send_array(A_complex)
 
+        elif request == b"get_arrays":
+            arrays = dict(A_int=A_int, A_complex=A_complex)
+            params = server.get_params()
+            server.send_arrays({param: arrays[param] for param in params})
+
         elif request == b"Send List":
             assert server.get(response=b"Oh boy, a list!") == [1, 2, 4]
         elif request == b"Send Int Array":
@@ -75,6 +81,12 @@ def run_client(host='localhost', port=12654):
     assert A.dtype == np.complex
     assert np.allclose(A, A_complex)
 
+    arrays = client.get_arrays(["A_int", "A_complex"])
+    assert arrays["A_int"].dtype == np.int
+    assert np.allclose(arrays["A_int"], A_int)
+    assert arrays["A_complex"].dtype == np.complex
+    assert np.allclose(arrays["A_complex"], A_complex)
+
     response = client.send(b"Send List", [1, 2, 4])
     assert response == b"Oh boy, a list!"
 
@@ -88,6 +100,43 @@ def run_client(host='localhost', port=12654):
     assert response == b"Quitting"
 
 
+def test_get_arrays(port=12655):
+    """Round-trip the multipart get_arrays/send_arrays protocol."""
+    opts = Namespace(host='localhost', port=port)
+    np.random.seed(2)
+    arrays = dict(
+        A_int=np.arange(10, dtype=int),
+        A_complex=np.random.random((3, 5)) + 1j*np.random.random((3, 5)),
+    )
+
+    def serve():
+        server = communication.Server(opts=opts)
+        while True:
+            request = server.recv()
+            if request == b"get_arrays":
+                params = server.get_params()
+                server.send_arrays({param: arrays[param] for param in params})
+            elif request == b"Quit":
+                server.respond(b"Quitting")
+                break
+            else:
+                server.respond(b"I don't know how to " + request)
+        server.socket.close(0)
+
+    server_thread = threading.Thread(target=serve)
+    server_thread.start()
+    try:
+        client = communication.Client(opts=opts)
+        res = client.get_arrays(["A_int", "A_complex"])
+        for name in arrays:
+            assert res[name].dtype == arrays[name].dtype
+            assert np.allclose(res[name], arrays[name])
+        assert client.do("Quit") == b"Quitting"
+        client.socket.close(0)
+    finally:
+        server_thread.join()
+
+
 @pytest.mark.skip("Known communication failure.")
 def test_client_server():
     server_thread = multiprocessing.Process(target=run_server)